@@ -6,11 +6,18 @@ including friendly ID mapping, time estimate formatting, and hierarchy generatio
 """
 
 import json
-import re
+import functools
 import logging
+import operator
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 
-from .marvin import MarvinAPI
+from .marvin import MarvinAPI, _json_dumps
+
+# Shared by all adapters for the concurrent category/task fetch, so threads
+# are not started and joined on every call
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="marvin-fetch")
 
 
 class MarvinAdapterError(Exception):
@@ -45,6 +52,110 @@ class InvalidTimeEstimateError(MarvinAdapterError):
         super().__init__(message)
 
 
+# Priorities accepted from tool calls, as strings or ints
+_VALID_PRIORITIES = frozenset(("1", "2", "3", 1, 2, 3))
+_INVALID_PRIORITY_MESSAGE = "Invalid priority value: {}. Must be 1, 2, or 3 (with 3 being highest)."
+
+
+def _validate_priority(priority: Any) -> None:
+    """Raise MarvinAdapterError unless priority is 1, 2 or 3."""
+    try:
+        valid = priority in _VALID_PRIORITIES
+    except TypeError:  # unhashable, e.g. a list from a malformed tool call
+        valid = False
+    if not valid:
+        raise MarvinAdapterError(_INVALID_PRIORITY_MESSAGE.format(priority))
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_time_estimate_ms(time_str: str) -> int:
+    """
+    Convert a time estimate like "30m", "1.5h" or "1h 30m" to milliseconds.
+
+    Space-separated parts are summed, and a part without a unit is read as minutes.
+    Memoized, since the same few estimates are used over and over.
+
+    Raises:
+        ValueError: If the format is invalid or the estimate is not positive
+    """
+    # Handle combined format like "1h 30m"
+    parts = time_str.split() if " " in time_str else (time_str,)
+    total_minutes = 0.0
+    for part in parts:
+        if part.endswith('h'):
+            total_minutes += float(part[:-1]) * 60
+        elif part.endswith('m'):
+            total_minutes += float(part[:-1])
+        else:
+            # Interpret a number without a unit as minutes
+            total_minutes += float(part)
+
+    if total_minutes <= 0:
+        raise ValueError(f"time estimate must be positive: {time_str!r}")
+
+    # Convert minutes to milliseconds
+    return int(total_minutes * 60 * 1000)
+
+
+def _is_yyyy_mm_dd(day: str) -> bool:
+    """Check that day is formatted as YYYY-MM-DD using plain character checks."""
+    return (len(day) == 10 and day[4] == "-" and day[7] == "-" and day.isascii()
+            and day[:4].isdigit() and day[5:7].isdigit() and day[8:].isdigit())
+
+
+_created_at = operator.itemgetter("createdAt")
+
+
+def _sorted_by_created(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort docs oldest first by createdAt, treating a missing createdAt as 0."""
+    try:
+        # C-level key function for the usual case where every doc has the field
+        return sorted(docs, key=_created_at)
+    except KeyError:
+        return sorted(docs, key=lambda d: d.get("createdAt", 0))
+
+
+# Bound encoder: json.dumps builds a new JSONEncoder on every call that passes options
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _dump_hierarchy(node: Dict[str, Any], level: int, out: List[str]) -> None:
+    """
+    Serialize a hierarchy node as indented JSON, writing each task on a single compact line.
+
+    Produces the same layout as json.dumps(indent=2) except that "tasks" arrays hold one
+    compact task object per line, which keeps list_tasks output short for the LLM.
+    """
+    if not node:
+        out.append("{}")
+        return
+
+    indent = "  " * (level + 1)
+    out.append("{")
+    separator = "\n"
+    for key, value in node.items():
+        out.append(separator)
+        separator = ",\n"
+        if not isinstance(key, str):
+            # Titles can be numbers, booleans or null in CouchDB; like json.dumps,
+            # write those keys as the string of their JSON literal
+            key = _encode_json(key)
+        out.append(indent + _encode_json(key) + ": ")
+        if key == "tasks" and isinstance(value, list):
+            if not value:
+                out.append("[]")
+                continue
+            task_indent = indent + "  "
+            out.append("[\n")
+            out.append(",\n".join(task_indent + _json_dumps(task).decode("utf-8") for task in value))
+            out.append("\n" + indent + "]")
+        elif isinstance(value, dict):
+            _dump_hierarchy(value, level + 1, out)
+        else:
+            out.append(_encode_json(value))
+    out.append("\n" + "  " * level + "}")
+
+
 class MarvinAdapter:
     """
     Adapter class that provides LLM-friendly interfaces to the MarvinAPI.
@@ -56,6 +167,19 @@ class MarvinAdapter:
     4. Translation between LLM formats and API formats
     """
 
+    __slots__ = (
+        "logger", "api",
+        "_project_id_map", "_category_id_map", "_task_id_map",
+        "_project_uuids", "_category_uuids", "_task_uuids",
+        "_parent_resolvers",
+        "_mutation_version", "_hierarchy", "_hierarchy_string",
+        "_hierarchy_version", "_hierarchy_sources"
+    )
+
+    # p0 is reserved for the Inbox (parentId "unassigned"); copied into each instance's maps
+    _BASE_PROJECT_ID_MAP = {"unassigned": "p0"}
+    _BASE_PROJECT_UUIDS = ("unassigned",)
+
     def __init__(self, marvin_api: MarvinAPI = None, log_level=None):
         """
         Initialize the MarvinAdapter with a MarvinAPI instance.
@@ -71,22 +195,31 @@ class MarvinAdapter:
         self.api = marvin_api if marvin_api else MarvinAPI()
 
         # Initialize ID mappings
-        # Maps real UUIDs to friendly IDs (p1, p2, etc.)
-        self._project_id_map = {}
-        self._project_id_reverse_map = {}  # Maps friendly IDs back to real UUIDs
+        # Maps real UUIDs to friendly IDs (p0 for the Inbox, then p1, p2, etc.)
+        self._project_id_map = dict(self._BASE_PROJECT_ID_MAP)
         # Maps real UUIDs to friendly IDs (c1, c2, etc.)
         self._category_id_map = {}
-        self._category_id_reverse_map = {}  # Maps friendly IDs back to real UUIDs
         # Maps real UUIDs to friendly IDs (t1, t2, etc.)
         self._task_id_map = {}
-        self._task_id_reverse_map = {}  # Maps friendly IDs back to real UUIDs
-        self._next_project_id = 1  # Start from p1 (p0 is reserved for Inbox)
-        self._next_category_id = 1  # Start from c1
-        self._next_task_id = 1
-        
-        # Add p0 as a special ID for the Inbox/unassigned
-        self._project_id_reverse_map["p0"] = "unassigned"
-        self._project_id_map["unassigned"] = "p0"
+        # Map friendly IDs back to real UUIDs: the UUID for pN is _project_uuids[N].
+        # Slot 0 is only valid for projects (p0), so numbering starts at 1 everywhere
+        self._project_uuids: List[Optional[str]] = list(self._BASE_PROJECT_UUIDS)
+        self._category_uuids: List[Optional[str]] = [None]
+        self._task_uuids: List[Optional[str]] = [None]
+
+        # Resolvers for parent IDs, keyed by friendly ID prefix
+        self._parent_resolvers = {
+            "c": self.get_real_category_id,
+            "p": self.get_real_project_id
+        }
+
+        # Last built hierarchy, reused while neither this adapter nor the API's
+        # category/task caches have changed since
+        self._mutation_version = 0  # Bumped by every method that writes to Marvin
+        self._hierarchy: Optional[Dict[str, Any]] = None
+        self._hierarchy_string: Optional[str] = None
+        self._hierarchy_version = -1
+        self._hierarchy_sources: Tuple[Any, Any] = (None, None)
         
         # Initialize ID maps deterministically based on creation date
         self.initialize_id_maps()
@@ -100,40 +233,91 @@ class MarvinAdapter:
         
         # Fetch all categories and tasks
         try:
-            categories = self.api.get_categories()
-            tasks = self.api.get_tasks()
-            
-            # Separate categories and projects
-            cat_categories = [c for c in categories if c.get("type") == "category"]
-            cat_projects = [c for c in categories if c.get("type") != "category"]
-            
-            # Sort categories by createdAt timestamp (oldest first)
-            sorted_categories = sorted(cat_categories, key=lambda c: c.get('createdAt', 0))
-            
-            # Assign category IDs based on sorted order
-            for category in sorted_categories:
-                self._get_friendly_category_id(category["_id"])
-                
-            # Sort projects by createdAt timestamp (oldest first)
-            sorted_projects = sorted(cat_projects, key=lambda c: c.get('createdAt', 0))
-            
-            # Assign project IDs based on sorted order
-            for project in sorted_projects:
-                self._get_friendly_project_id(project["_id"])
-                
-            # Sort tasks by createdAt timestamp (oldest first)
-            sorted_tasks = sorted(tasks, key=lambda t: t.get('createdAt', 0))
-            
-            # Assign task IDs based on sorted order
-            for task in sorted_tasks:
-                self._get_friendly_task_id(task["_id"])
-                
+            categories, tasks = self._fetch_categories_and_tasks()
+            self._assign_ids_by_creation(categories, tasks)
             self.logger.info(f"Successfully initialized ID maps with {len(self._project_id_map)} projects, {len(self._category_id_map)} categories, and {len(self._task_id_map)} tasks")
         except Exception as e:
             self.logger.error(f"Error initializing ID maps: {str(e)}")
             # Continue with empty maps, they will be populated as needed
             pass
 
+    def _assign_ids_by_creation(self, categories: List[Dict[str, Any]],
+                                tasks: List[Dict[str, Any]]) -> None:
+        """
+        Give every category, project and task that has no friendly ID yet the next one.
+
+        New items are numbered oldest first by createdAt, so IDs come out the same
+        regardless of where the items sit in the hierarchy.
+        """
+        category_map = self._category_id_map
+        project_map = self._project_id_map
+        task_map = self._task_id_map
+
+        # Pick out the new items before sorting; usually there are none
+        new_categories = []
+        new_projects = []
+        for c in categories:
+            if c.get("type") == "category":
+                if c["_id"] not in category_map:
+                    new_categories.append(c)
+            elif c["_id"] not in project_map:
+                new_projects.append(c)
+        new_tasks = [t for t in tasks if t["_id"] not in task_map]
+
+        if new_categories:
+            self._assign_friendly_ids(_sorted_by_created(new_categories), "c",
+                                      category_map, self._category_uuids)
+        if new_projects:
+            self._assign_friendly_ids(_sorted_by_created(new_projects), "p",
+                                      project_map, self._project_uuids)
+        if new_tasks:
+            self._assign_friendly_ids(_sorted_by_created(new_tasks), "t",
+                                      task_map, self._task_uuids)
+
+    @staticmethod
+    def _assign_friendly_id(uuid: str, prefix: str, id_map: Dict[str, str],
+                            uuids: List[Optional[str]]) -> str:
+        """
+        Assign the next friendly ID for prefix to a UUID that has none yet.
+
+        The number is the UUID's index in uuids, which it is appended to.
+        """
+        friendly_id = f"{prefix}{len(uuids)}"
+        id_map[uuid] = friendly_id
+        uuids.append(uuid)
+        return friendly_id
+
+    @staticmethod
+    def _assign_friendly_ids(docs: List[Dict[str, Any]], prefix: str, id_map: Dict[str, str],
+                             uuids: List[Optional[str]]) -> None:
+        """
+        Assign friendly IDs, in order, to every doc whose UUID has none yet.
+
+        Batch form of _assign_friendly_id: the new UUIDs are collected first and then
+        added to both mappings in bulk.
+        """
+        # dict.fromkeys drops duplicates while keeping the first occurrence's position
+        new_uuids = [uuid for uuid in dict.fromkeys(doc["_id"] for doc in docs)
+                     if uuid and uuid not in id_map]
+        start = len(uuids)
+        id_map.update(zip(new_uuids, [f"{prefix}{n}" for n in range(start, start + len(new_uuids))]))
+        uuids.extend(new_uuids)
+
+    @staticmethod
+    def _lookup_friendly_id(friendly_id: str, prefix: str, uuids: List[Optional[str]]) -> Optional[str]:
+        """
+        Return the UUID for a friendly ID like "t12", or None if it is not a known ID for prefix.
+
+        Only the canonical spelling is accepted, so "t012" or "t+12" do not resolve.
+        """
+        digits = friendly_id[1:]
+        if friendly_id[:1] != prefix or not (digits.isascii() and digits.isdigit()):
+            return None
+        number = int(digits)
+        if number >= len(uuids) or str(number) != digits:
+            return None
+        return uuids[number]
+
     def _get_friendly_project_id(self, uuid: str) -> str:
         """
         Get a friendly project ID (p1, p2, etc.) for a UUID.
@@ -142,12 +326,11 @@ class MarvinAdapter:
         if not uuid:
             return ""
 
-        if uuid not in self._project_id_map:
-            friendly_id = f"p{self._next_project_id}"
-            self._project_id_map[uuid] = friendly_id
-            self._project_id_reverse_map[friendly_id] = uuid
-            self._next_project_id += 1
-        return self._project_id_map[uuid]
+        friendly_id = self._project_id_map.get(uuid)
+        if friendly_id is not None:
+            return friendly_id
+        return self._assign_friendly_id(uuid, "p", self._project_id_map,
+                                        self._project_uuids)
 
     def _get_friendly_task_id(self, uuid: str) -> str:
         """
@@ -157,12 +340,11 @@ class MarvinAdapter:
         if not uuid:
             return ""
 
-        if uuid not in self._task_id_map:
-            friendly_id = f"t{self._next_task_id}"
-            self._task_id_map[uuid] = friendly_id
-            self._task_id_reverse_map[friendly_id] = uuid
-            self._next_task_id += 1
-        return self._task_id_map[uuid]
+        friendly_id = self._task_id_map.get(uuid)
+        if friendly_id is not None:
+            return friendly_id
+        return self._assign_friendly_id(uuid, "t", self._task_id_map,
+                                        self._task_uuids)
 
     def _get_friendly_category_id(self, uuid: str) -> str:
         """
@@ -172,12 +354,11 @@ class MarvinAdapter:
         if not uuid:
             return ""
 
-        if uuid not in self._category_id_map:
-            friendly_id = f"c{self._next_category_id}"
-            self._category_id_map[uuid] = friendly_id
-            self._category_id_reverse_map[friendly_id] = uuid
-            self._next_category_id += 1
-        return self._category_id_map[uuid]
+        friendly_id = self._category_id_map.get(uuid)
+        if friendly_id is not None:
+            return friendly_id
+        return self._assign_friendly_id(uuid, "c", self._category_id_map,
+                                        self._category_uuids)
 
     def get_real_project_id(self, friendly_id: str) -> str:
         """
@@ -195,10 +376,10 @@ class MarvinAdapter:
         if not friendly_id:
             raise MarvinAdapterError("Project ID cannot be empty.")
             
-        if friendly_id in self._project_id_reverse_map:
-            return self._project_id_reverse_map[friendly_id]
-        else:
+        real_id = self._lookup_friendly_id(friendly_id, "p", self._project_uuids)
+        if real_id is None:
             raise InvalidProjectIDError(friendly_id)
+        return real_id
             
     def get_real_task_id(self, friendly_id: str) -> str:
         """
@@ -215,15 +396,11 @@ class MarvinAdapter:
         """
         if not friendly_id:
             raise MarvinAdapterError("Task ID cannot be empty.")
-        
-        # Task ID must start with t
-        if not friendly_id.startswith('t'):
-            raise InvalidTaskIDError(friendly_id)
-            
-        if friendly_id in self._task_id_reverse_map:
-            return self._task_id_reverse_map[friendly_id]
-        else:
+
+        real_id = self._lookup_friendly_id(friendly_id, "t", self._task_uuids)
+        if real_id is None:
             raise InvalidTaskIDError(friendly_id)
+        return real_id
 
     def get_real_category_id(self, friendly_id: str) -> str:
         """
@@ -240,15 +417,33 @@ class MarvinAdapter:
         """
         if not friendly_id:
             raise MarvinAdapterError("Category ID cannot be empty.")
-            
-        # Category ID must start with c
-        if not friendly_id.startswith('c'):
-            raise MarvinAdapterError(f"Invalid category ID: '{friendly_id}'. Use a valid category ID (c1, c2, etc.)")
-            
-        if friendly_id in self._category_id_reverse_map:
-            return self._category_id_reverse_map[friendly_id]
-        else:
+
+        real_id = self._lookup_friendly_id(friendly_id, "c", self._category_uuids)
+        if real_id is None:
             raise MarvinAdapterError(f"Invalid category ID: '{friendly_id}'. Use a valid category ID (c1, c2, etc.)")
+        return real_id
+
+    def _resolve_parent(self, parent_id: Optional[str], default: str) -> str:
+        """
+        Convert a friendly parent ID (c1 or p1) back to the real UUID.
+
+        Args:
+            parent_id: A category or project friendly ID, or empty for no parent.
+            default: The real parent ID to use when parent_id is empty.
+
+        Returns:
+            The real UUID, or default.
+
+        Raises:
+            MarvinAdapterError: If parent_id is not a valid category or project ID.
+        """
+        if not parent_id:
+            return default
+
+        resolve = self._parent_resolvers.get(parent_id[0])
+        if resolve is None:
+            raise MarvinAdapterError(f"Invalid parent ID: '{parent_id}'. Must start with 'c' for categories or 'p' for projects.")
+        return resolve(parent_id)
 
     def parse_time_estimate(self, time_str: str) -> Optional[int]:
         """
@@ -267,49 +462,20 @@ class MarvinAdapter:
         if not time_str:
             return None
 
-        total_minutes = 0
-
-        # Handle combined format like "1h 30m"
-        if " " in time_str:
-            parts = time_str.split()
-            for part in parts:
-                minutes = self._parse_single_time_part(part)
-                if minutes is not None:
-                    total_minutes += minutes
-                else:
-                    raise InvalidTimeEstimateError(time_str)
-        else:
-            # Handle single unit like "1.5h" or "30m"
-            minutes = self._parse_single_time_part(time_str)
-            if minutes is not None:
-                total_minutes = minutes
-            else:
-                raise InvalidTimeEstimateError(time_str)
-
-        if total_minutes > 0:
-            # Convert minutes to milliseconds
-            return int(total_minutes * 60 * 1000)
-        
-        raise InvalidTimeEstimateError(time_str)
-
-    def _parse_single_time_part(self, part: str) -> Optional[float]:
-        """Parse a single time part like "1.5h" or "30m" into minutes."""
         try:
-            if part.endswith('h'):
-                hours = float(part[:-1])
-                return hours * 60
-            elif part.endswith('m'):
-                return float(part[:-1])
-            else:
-                # Try to interpret as minutes if no unit is specified
-                return float(part)
+            return _parse_time_estimate_ms(time_str)
         except ValueError:
-            return None
+            raise InvalidTimeEstimateError(time_str) from None
 
-    def format_time_estimate(self, milliseconds: Optional[int]) -> Optional[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def format_time_estimate(milliseconds: Optional[int]) -> Optional[str]:
         """
         Format a time estimate from milliseconds to a human-readable string.
 
+        Results are memoized: estimates cluster around a few values (15m, 30m, 1h),
+        so most tasks in a hierarchy hit the cache.
+
         Args:
             milliseconds: Time in milliseconds
 
@@ -319,6 +485,15 @@ class MarvinAdapter:
         if milliseconds is None:
             return None
 
+        # Estimates from the API are normally whole milliseconds, which integer
+        # arithmetic handles without the float round trip
+        if isinstance(milliseconds, int) and milliseconds >= 0:
+            if milliseconds < 3600000:
+                return f"{milliseconds // 60000}m"
+            if milliseconds % 3600000 == 0:
+                return f"{milliseconds // 3600000}h"
+            return f"{milliseconds / 3600000:.1f}h"
+
         hours = milliseconds / (1000 * 60 * 60)
 
         # Less than an hour, show in minutes
@@ -335,23 +510,30 @@ class MarvinAdapter:
 
     def _process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Process a task into a compact format with a friendly ID."""
-        friendly_id = self._get_friendly_task_id(task["_id"])
+        get = task.get
+        title = get("title", "Untitled Task")
+        due = get("dueDate")
+        est_ms = get("timeEstimate")
+        star = get("isStarred")
+
+        # Known tasks resolve with one dict lookup, skipping the method call
+        uuid = task["_id"]
         res = {
-            "t": task.get("title", "Untitled Task"),
-            "id": friendly_id
+            "t": title,
+            "id": self._task_id_map.get(uuid) or self._get_friendly_task_id(uuid)
         }
 
-        if task.get("dueDate"):
-            res["due"] = task["dueDate"]
+        if due:
+            res["due"] = due
 
         # Format time estimate
-        if task.get("timeEstimate"):
-            est = self.format_time_estimate(task.get("timeEstimate"))
+        if est_ms:
+            est = self.format_time_estimate(est_ms)
             if est:
                 res["est"] = est
 
-        if task.get("isStarred"):
-            res["pri"] = task.get("isStarred")
+        if star:
+            res["pri"] = star
 
         return res
 
@@ -364,75 +546,134 @@ class MarvinAdapter:
         result["done"] = task.get("done", False)
         
         # Add day field if it exists
-        if task.get("day") and task.get("day") != "unassigned":
-            result["day"] = task.get("day")
+        day = task.get("day")
+        if day and day != "unassigned":
+            result["day"] = day
             
         return result
 
     def _process_category(self, cat: Dict[str, Any]) -> Dict[str, Any]:
         """Process a category/project into a compact format with a friendly ID."""
-        is_category = cat.get("type") == "category"
+        get = cat.get
+        is_category = get("type") == "category"
         
+        uuid = cat["_id"]
         if is_category:
-            friendly_id = self._get_friendly_category_id(cat["_id"])
+            friendly_id = self._category_id_map.get(uuid) or self._get_friendly_category_id(uuid)
         else:
-            friendly_id = self._get_friendly_project_id(cat["_id"])
+            friendly_id = self._project_id_map.get(uuid) or self._get_friendly_project_id(uuid)
             
         data: Dict[str, Any] = {
             "id": friendly_id
         }
 
-        if cat.get("priority"):
-            data["pri"] = cat["priority"]
+        priority = get("priority")
+        if priority:
+            data["pri"] = priority
 
-        if cat.get("dueDate"):
-            data["due"] = cat["dueDate"]
+        due = get("dueDate")
+        if due:
+            data["due"] = due
 
         return data
 
-    def build_hierarchy(self) -> Dict[str, Any]:
+    def _fetch_categories_and_tasks(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Build the hierarchical structure of categories and tasks.
+        Fetch categories and tasks from the API concurrently.
+
+        The two requests are independent and network-bound, so overlapping them
+        roughly halves the wait compared to issuing them one after the other.
 
         Returns:
-            A dictionary with the LLM-friendly hierarchy
+            Tuple of (categories, tasks)
         """
-        # Fetch all categories and tasks
-        categories = self.api.get_categories()
-        tasks = self.api.get_tasks()
-
-        # Find root categories (parentId is "root" or missing)
-        root_categories = [cat for cat in categories if cat.get(
-            "parentId") == "root" or not cat.get("parentId")]
+        categories_future = _FETCH_EXECUTOR.submit(self.api.get_categories)
+        tasks_future = _FETCH_EXECUTOR.submit(self.api.get_tasks)
+        return categories_future.result(), tasks_future.result()
+
+    def _build_subtrees(self, items: List[Dict[str, Any]], container: Dict[str, Any],
+                        cats_by_parent: Dict[str, List[Dict[str, Any]]],
+                        tasks_by_parent: Dict[str, List[Dict[str, Any]]],
+                        untitled: str = "Untitled") -> None:
+        """
+        Add items and everything below them to container as compact hierarchy entries.
 
-        # Find categories with parentId 'unassigned' (should go under Inbox)
-        inbox_categories = [cat for cat in categories if cat.get(
-            "parentId") == "unassigned"]
-        inbox_tasks = [t for t in tasks if t.get("parentId") == "unassigned"]
+        Walks depth-first with an explicit stack so deep trees don't pay per-level call
+        overhead or hit the recursion limit.
 
-        # Build the hierarchy with compact entries
-        def process_category_recursive(item: Dict[str, Any]) -> Dict[str, Any]:
+        Args:
+            items: Categories/projects to add, in order
+            container: Dict the entries are added to, keyed by title
+            cats_by_parent: Categories/projects indexed by parentId
+            tasks_by_parent: Tasks indexed by parentId
+            untitled: Title for items in this container that have none
+        """
+        # Entries are (category, dict it belongs in, fallback title); children are
+        # pushed in reverse so they are visited in their original order
+        stack = [(item, container, untitled) for item in reversed(items)]
+        # Bound once: these run for every node and task in the tree
+        pop = stack.pop
+        process_category = self._process_category
+        process_task = self._process_task
+        tasks_for = tasks_by_parent.get
+        subs_for = cats_by_parent.get
+        while stack:
+            item, parent, fallback_title = pop()
             item_id = item["_id"]
-            item_data = self._process_category(item)
+            item_data = process_category(item)
 
             # Add tasks for both projects and categories
-            tlist = [self._process_task(t)
-                    for t in tasks if t.get("parentId") == item_id]
-            if tlist:
-                item_data["tasks"] = tlist
+            child_tasks = tasks_for(item_id)
+            if child_tasks:
+                item_data["tasks"] = list(map(process_task, child_tasks))
+
+            parent[item.get("title", fallback_title)] = item_data
 
             # Add subcategories and subprojects
-            subs = [c for c in categories if c.get("parentId") == item_id]
-            
+            subs = subs_for(item_id)
             if subs:
                 item_data["sub"] = {}
-                
-                # Process all sub-items
-                for sub in subs:
-                    sub_title = sub.get("title", "Untitled")
-                    item_data["sub"][sub_title] = process_category_recursive(sub)
+                stack.extend((sub, item_data["sub"], "Untitled")
+                             for sub in reversed(subs))
+
+    def build_hierarchy(self) -> Dict[str, Any]:
+        """
+        Build the hierarchical structure of categories and tasks.
+
+        The result is cached and returned as-is while nothing has been written through
+        this adapter and the API hands back the same cached category and task lists,
+        so callers must not modify it.
 
-            return item_data
+        Returns:
+            A dictionary with the LLM-friendly hierarchy
+        """
+        # Fetch all categories and tasks
+        categories, tasks = self._fetch_categories_and_tasks()
+
+        if (self._hierarchy is not None
+                and self._hierarchy_version == self._mutation_version
+                and self._hierarchy_sources[0] is categories
+                and self._hierarchy_sources[1] is tasks):
+            return self._hierarchy
+
+        # Number anything new in one batch, so the walk below only does map lookups
+        self._assign_ids_by_creation(categories, tasks)
+
+        # Index categories and tasks by parentId once so each lookup below is O(1)
+        # Categories without a parentId are top-level, same as parentId "root"
+        cats_by_parent = defaultdict(list)
+        for cat in categories:
+            cats_by_parent[cat.get("parentId") or "root"].append(cat)
+        tasks_by_parent = defaultdict(list)
+        for t in tasks:
+            tasks_by_parent[t.get("parentId")].append(t)
+
+        # Find root categories (parentId is "root" or missing)
+        root_categories = cats_by_parent.get("root", [])
+
+        # Find categories with parentId 'unassigned' (should go under Inbox)
+        inbox_categories = cats_by_parent.get("unassigned", [])
+        inbox_tasks = tasks_by_parent.get("unassigned", [])
 
         hierarchy = {}
 
@@ -441,9 +682,8 @@ class MarvinAdapter:
             inbox_dict = {"id": "p0"}  # Assign p0 ID to the Inbox
             if inbox_categories:
                 inbox_dict["sub"] = {}
-                for cat in inbox_categories:
-                    cat_title = cat.get("title", "Untitled Category")
-                    inbox_dict["sub"][cat_title] = process_category_recursive(cat)
+                self._build_subtrees(inbox_categories, inbox_dict["sub"], cats_by_parent,
+                                     tasks_by_parent, "Untitled Category")
             
             if inbox_tasks:
                 inbox_dict["tasks"] = [
@@ -451,10 +691,12 @@ class MarvinAdapter:
             hierarchy["Inbox"] = inbox_dict
 
         # Add root categories/projects
-        for rc in root_categories:
-            rc_title = rc.get("title", "Untitled")
-            hierarchy[rc_title] = process_category_recursive(rc)
+        self._build_subtrees(root_categories, hierarchy, cats_by_parent, tasks_by_parent)
 
+        self._hierarchy = hierarchy
+        self._hierarchy_string = None
+        self._hierarchy_version = self._mutation_version
+        self._hierarchy_sources = (categories, tasks)
         return hierarchy
 
     def build_hierarchy_string(self) -> str:
@@ -466,32 +708,12 @@ class MarvinAdapter:
         """
         hierarchy = self.build_hierarchy()
 
-        # Convert to JSON with initial indentation
-        json_str = json.dumps(hierarchy, indent=2)
-
-        # Use regex to compact the task arrays for better readability
-        def compact_tasks(match):
-            tasks = json.loads(match.group(2))
-            if not tasks:
-                return '"tasks": []'
-
-            prefix = match.group(1)
-            task_indent = prefix + '  '
-            lines = [prefix + '"tasks": [']
-
-            for i, task in enumerate(tasks):
-                line = task_indent + json.dumps(task, separators=(',', ':'))
-                if i < len(tasks) - 1:
-                    line += ','
-                lines.append(line)
-
-            lines.append(prefix + ']')
-            return '\n'.join(lines)
-
-        pattern = r'^(\s*)"tasks": (\[[\s\S]*?\])'
-        json_str = re.sub(pattern, compact_tasks, json_str, flags=re.MULTILINE)
-
-        return json_str
+        # build_hierarchy clears the cached string whenever it rebuilds
+        if self._hierarchy_string is None:
+            out: List[str] = []
+            _dump_hierarchy(hierarchy, 0, out)
+            self._hierarchy_string = "".join(out)
+        return self._hierarchy_string
 
     def create_task(self, title: str, parent_id: str, due_date: Optional[str] = None, 
                     time_estimate: Optional[str] = None, priority: Optional[str] = None) -> Dict[str, Any]:
@@ -515,16 +737,7 @@ class MarvinAdapter:
             raise MarvinAdapterError("Task title cannot be empty")
             
         # Convert parent_id from friendly ID to real ID
-        real_parent_id = "unassigned"
-        if parent_id:
-            if parent_id.startswith('c'):
-                # Parent is a category
-                real_parent_id = self.get_real_category_id(parent_id)
-            elif parent_id.startswith('p'):
-                # Parent is a project
-                real_parent_id = self.get_real_project_id(parent_id)
-            else:
-                raise MarvinAdapterError(f"Invalid parent ID: '{parent_id}'. Must start with 'c' for categories or 'p' for projects.")
+        real_parent_id = self._resolve_parent(parent_id, "unassigned")
 
         # Convert time estimate from human-readable to milliseconds
         time_ms = None
@@ -532,8 +745,8 @@ class MarvinAdapter:
             time_ms = self.parse_time_estimate(time_estimate)
             
         # Validate priority if provided
-        if priority and priority not in ["1", "2", "3", 1, 2, 3]:
-            raise MarvinAdapterError(f"Invalid priority value: {priority}. Must be 1, 2, or 3 (with 3 being highest).")
+        if priority:
+            _validate_priority(priority)
 
         # Create the task using the API
         api_result = self.api.create_task(
@@ -544,6 +757,8 @@ class MarvinAdapter:
             priority=priority
         )
 
+        self._mutation_version += 1
+
         # Get the task ID and assign a friendly ID
         task_id = api_result.get("id", "")
         friendly_id = self._get_friendly_task_id(task_id)
@@ -582,16 +797,7 @@ class MarvinAdapter:
             raise MarvinAdapterError("Project title cannot be empty")
             
         # Convert parent_id from friendly ID to real ID
-        real_parent_id = "root"
-        if parent_id:
-            if parent_id.startswith('c'):
-                # Parent is a category
-                real_parent_id = self.get_real_category_id(parent_id)
-            elif parent_id.startswith('p'):
-                # Parent is a project
-                real_parent_id = self.get_real_project_id(parent_id)
-            else:
-                raise MarvinAdapterError(f"Invalid parent ID: '{parent_id}'. Must start with 'c' for categories or 'p' for projects.")
+        real_parent_id = self._resolve_parent(parent_id, "root")
 
         # Create the project using the API
         api_result = self.api.create_project(
@@ -601,6 +807,8 @@ class MarvinAdapter:
             priority=priority
         )
 
+        self._mutation_version += 1
+
         # Get the project ID and assign a friendly ID
         project_id = api_result.get("id", "")
         friendly_id = self._get_friendly_project_id(project_id)
@@ -638,20 +846,11 @@ class MarvinAdapter:
             raise MarvinAdapterError("Category title cannot be empty")
             
         # Convert parent_id from friendly ID to real ID
-        real_parent_id = "root"
-        if parent_id:
-            if parent_id.startswith('c'):
-                # Parent is a category
-                real_parent_id = self.get_real_category_id(parent_id)
-            elif parent_id.startswith('p'):
-                # Parent is a project
-                real_parent_id = self.get_real_project_id(parent_id)
-            else:
-                raise MarvinAdapterError(f"Invalid parent ID: '{parent_id}'. Must start with 'c' for categories or 'p' for projects.")
+        real_parent_id = self._resolve_parent(parent_id, "root")
 
         # Validate priority if provided
-        if priority and priority not in ["1", "2", "3", 1, 2, 3]:
-            raise MarvinAdapterError(f"Invalid priority value: {priority}. Must be 1, 2, or 3 (with 3 being highest).")
+        if priority:
+            _validate_priority(priority)
 
         # Create the category using the API
         api_result = self.api.create_category(
@@ -661,6 +860,8 @@ class MarvinAdapter:
             priority=priority
         )
 
+        self._mutation_version += 1
+
         # Get the category ID and assign a friendly ID
         category_id = api_result.get("id", "")
         friendly_id = self._get_friendly_category_id(category_id)
@@ -722,18 +923,7 @@ class MarvinAdapter:
             
         # Handle parent_id if provided
         if parent_id is not None:
-            if parent_id:
-                if parent_id.startswith('c'):
-                    # Parent is a category
-                    real_parent_id = self.get_real_category_id(parent_id)
-                elif parent_id.startswith('p'):
-                    # Parent is a project
-                    real_parent_id = self.get_real_project_id(parent_id) 
-                else:
-                    raise MarvinAdapterError(f"Invalid parent ID: '{parent_id}'. Must start with 'c' for categories or 'p' for projects.")
-                api_updates["parentId"] = real_parent_id
-            else:
-                api_updates["parentId"] = "unassigned"
+            api_updates["parentId"] = self._resolve_parent(parent_id, "unassigned")
                 
         # Handle due_date if provided
         if due_date is not None:
@@ -741,15 +931,17 @@ class MarvinAdapter:
             
         # Handle priority if provided
         if priority is not None:
-            if priority and priority not in ["1", "2", "3", 1, 2, 3]:
-                raise MarvinAdapterError(f"Invalid priority value: {priority}. Must be 1, 2, or 3 (with 3 being highest).")
+            if priority:
+                _validate_priority(priority)
             api_updates["isStarred"] = priority
 
         # Update the task using the API
         api_result = self.api.update_task(real_task_id, api_updates)
 
-        # Get the task ID and assign a friendly ID
-        friendly_id = self._get_friendly_task_id(real_task_id)
+        self._mutation_version += 1
+
+        # get_real_task_id only accepts the canonical friendly ID, so task_id is it
+        friendly_id = task_id
 
         # Return LLM-friendly result with only the fields that were updated
         response = {
@@ -807,8 +999,10 @@ class MarvinAdapter:
         # Update the task using the API
         api_result = self.api.update_task(real_task_id, updates)
 
-        # Get the friendly ID
-        friendly_id = self._get_friendly_task_id(real_task_id)
+        self._mutation_version += 1
+
+        # get_real_task_id only accepts the canonical friendly ID, so task_id is it
+        friendly_id = task_id
 
         # Create LLM-friendly response
         response = {
@@ -836,7 +1030,7 @@ class MarvinAdapter:
             MarvinAdapterError: If the day format is invalid
         """
         # Validate date format
-        if not re.match(r'^\d{4}-\d{2}-\d{2}$', day):
+        if not _is_yyyy_mm_dd(day):
             raise MarvinAdapterError(f"Invalid date format: {day}. Use YYYY-MM-DD format.")
             
         # Get tasks for the day from API
@@ -6,7 +6,7 @@ including input schemas and explanations of return values.
 """
 
 LIST_TASKS_DESCRIPTION = """Get the hierarchical structure of projects, categories, and tasks from Amazing Marvin.
-            
+
 The output structure uses the following abbreviations:
 - "t": Title of the task
 - "due": Due date (YYYY-MM-DD)
@@ -69,26 +69,22 @@ CREATE_TASK_DESCRIPTION = """Create a new task in Amazing Marvin.
 
 You can create tasks with various properties and place them in specific projects using their IDs.
 Time estimates can be specified in human-readable format like "30m", "1.5h", or "1h 30m".
-Priority can be set from 1-3, with 3 being the highest priority.
-"""
+Priority can be set from 1-3, with 3 being the highest priority."""
 
 CREATE_PROJECT_DESCRIPTION = """Create a new project in Amazing Marvin.
 
 You can create projects with various properties and place them within other projects or categories.
 Projects can contain tasks and can also contain other subprojects.
-Use projects for actionable multi-step items that require completion.
-"""
+Use projects for actionable multi-step items that require completion."""
 
 UPDATE_TASK_DESCRIPTION = """Update an existing task in Amazing Marvin.
 
 You can update basic properties of a task such as its title, parent project, due date, time estimate, and priority.
-For scheduling tasks to specific days, use the schedule_task tool instead.
-"""
+For scheduling tasks to specific days, use the schedule_task tool instead."""
 
 SCHEDULE_TASK_DESCRIPTION = """Schedule a task for a specific day in Amazing Marvin.
 
-This tool allows you to specify which day a task should be worked on (as opposed to when it's due).
-"""
+This tool allows you to specify which day a task should be worked on (as opposed to when it's due)."""
 
 GET_DAY_TASKS_DESCRIPTION = """Get all tasks scheduled for a specific day.
 
@@ -97,8 +93,7 @@ You can use this to review what tasks are set for a particular date.
 
 Required format for the day parameter is YYYY-MM-DD (e.g., 2025-05-14).
 
-The response includes a list of tasks with their completion status, due dates, time estimates, and priorities.
-"""
+The response includes a list of tasks with their completion status, due dates, time estimates, and priorities."""
 
 CREATE_CATEGORY_DESCRIPTION = """Create a new category in Amazing Marvin.
 
@@ -116,10 +111,16 @@ Example uses:
 - Organizing projects into logical groups
 - Creating a hierarchical structure for your tasks
 
-The response includes the created category information and its new ID.
-"""
+The response includes the created category information and its new ID."""
 
 # Input schemas for each tool
+
+# Property blocks that are identical across schemas are defined once and shared
+_OPTIONAL_PRIORITY_PROPERTY = {
+    "type": "string",
+    "description": "Optional priority level (1-3, with 3 being highest)"
+}
+
 LIST_TASKS_SCHEMA = {
     "type": "object",
     "properties": {},
@@ -135,10 +136,9 @@ CREATE_TASK_SCHEMA = {
         },
         "parent_id": {
             "type": "string",
-            "description": """Optional ID of the parent project or category where the task should be created. 
+            "description": """Optional ID of the parent project or category where the task should be created.
   * Can be either a project ID ("p1", "p2", etc.) or a category ID ("c1", "c2", etc.)
-  * If this parameter is not provided, the task will be created in the Inbox.
-"""
+  * If this parameter is not provided, the task will be created in the Inbox."""
         },
         "due_date": {
             "type": "string",
@@ -148,10 +148,7 @@ CREATE_TASK_SCHEMA = {
             "type": "string",
             "description": "Optional time estimate in human-readable format (e.g., '30m', '1.5h', '1h 30m')"
         },
-        "priority": {
-            "type": "string",
-            "description": "Optional priority level (1-3, with 3 being highest)"
-        }
+        "priority": _OPTIONAL_PRIORITY_PROPERTY
     },
     "required": ["title"]
 }
@@ -165,19 +162,15 @@ CREATE_PROJECT_SCHEMA = {
         },
         "parent_id": {
             "type": "string",
-            "description": """Optional ID of the parent project or category where the project should be created. 
+            "description": """Optional ID of the parent project or category where the project should be created.
   * Can be either a project ID ("p1", "p2", etc.) or a category ID ("c1", "c2", etc.)
-  * If this parameter is not provided, the project will be created at the root level.
-"""
+  * If this parameter is not provided, the project will be created at the root level."""
         },
         "due_date": {
             "type": "string",
             "description": "Optional due date for the project (YYYY-MM-DD)"
         },
-        "priority": {
-            "type": "string",
-            "description": "Optional priority level (1-3, with 3 being highest)"
-        }
+        "priority": _OPTIONAL_PRIORITY_PROPERTY
     },
     "required": ["title"]
 }
@@ -248,19 +241,27 @@ CREATE_CATEGORY_SCHEMA = {
         },
         "parent_id": {
             "type": "string",
-            "description": """Optional ID of the parent category or project where the category should be created. 
+            "description": """Optional ID of the parent category or project where the category should be created.
   * Can be either a project ID ("p1", "p2", etc.) or a category ID ("c1", "c2", etc.)
-  * If this parameter is not provided, the category will be created at the root level.
-"""
+  * If this parameter is not provided, the category will be created at the root level."""
         },
         "due_date": {
             "type": "string",
             "description": "Optional due date for the category (YYYY-MM-DD)"
         },
-        "priority": {
-            "type": "string",
-            "description": "Optional priority level (1-3, with 3 being highest)"
-        }
+        "priority": _OPTIONAL_PRIORITY_PROPERTY
     },
     "required": ["title"]
-}
\ No newline at end of file
+}
+
+
+# Every tool the server exposes, in list_tools order, built once at import
+TOOLS_MANIFEST = (
+    {"name": "list_tasks", "description": LIST_TASKS_DESCRIPTION, "inputSchema": LIST_TASKS_SCHEMA},
+    {"name": "create_task", "description": CREATE_TASK_DESCRIPTION, "inputSchema": CREATE_TASK_SCHEMA},
+    {"name": "create_project", "description": CREATE_PROJECT_DESCRIPTION, "inputSchema": CREATE_PROJECT_SCHEMA},
+    {"name": "update_task", "description": UPDATE_TASK_DESCRIPTION, "inputSchema": UPDATE_TASK_SCHEMA},
+    {"name": "schedule_task", "description": SCHEDULE_TASK_DESCRIPTION, "inputSchema": SCHEDULE_TASK_SCHEMA},
+    {"name": "get_day_tasks", "description": GET_DAY_TASKS_DESCRIPTION, "inputSchema": GET_DAY_TASKS_SCHEMA},
+    {"name": "create_category", "description": CREATE_CATEGORY_DESCRIPTION, "inputSchema": CREATE_CATEGORY_SCHEMA},
+)
@@ -9,12 +9,26 @@ without any LLM-specific formatting or adaptations.
 
 import os
 import json
+import base64
 import requests
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, stream-parses large _find responses when installed
+    ijson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +36,102 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Load .env once at import rather than re-reading it for every MarvinAPI instance
+load_dotenv()
+
+# Shared HTTP session so every MarvinAPI instance reuses pooled keep-alive
+# connections to CouchDB instead of paying a new TCP/TLS handshake per client.
+# Credentials are passed per request so instances never clobber each other.
+_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    # Only idempotent reads are retried; once retries run out the last 5xx response
+    # is returned so raise_for_status() still raises HTTPError as before
+    max_retries=Retry(total=3, backoff_factor=0.2,
+                      status_forcelist=[500, 502, 503, 504],
+                      allowed_methods=frozenset({"GET", "HEAD"}),
+                      raise_on_status=False)
+)
+_SESSION.mount("http://", _HTTP_ADAPTER)
+_SESSION.mount("https://", _HTTP_ADAPTER)
+_SESSION.headers.update({
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+})
+
+# Compact encoder for the stdlib fallback, matching orjson's output
+_encode_compact_json = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _encode_compact_json(obj).encode("utf-8")
+
+
+# Mango indexes backing the _find queries, created on first use in one design doc
+# when CREATE_INDEXES is enabled. Only fields present on every document of a type
+# are indexed: CouchDB leaves a document out of a json index when it lacks an
+# indexed field, and many tasks have no "done" field at all.
+_INDEX_DDOC = "amazing-marvin-mcp"
+_INDEXES = {
+    "by-db": ["db"],
+    "tasks-by-parent": ["db", "parentId"],
+    "tasks-by-day": ["db", "day"],
+}
+
+# Database URLs whose indexes have been created, shared by every MarvinAPI instance.
+# The lock keeps concurrent fetches from creating them twice.
+_INDEXED_DATABASES = set()
+_INDEXES_LOCK = threading.Lock()
+
+# Fields requested from _find, covering everything the adapter and the rank
+# calculations read. CouchDB then skips sending the rest of each document,
+# most notably the fieldUpdates history.
+_CATEGORY_FIELDS = [
+    "_id", "type", "title", "parentId", "priority", "dueDate",
+    "createdAt", "rank", "masterRank"
+]
+_TASK_FIELDS = [
+    "_id", "title", "parentId", "day", "dueDate", "timeEstimate", "isStarred",
+    "done", "createdAt", "rank", "masterRank"
+]
+
+# Selector clause matching documents that are not done; "done" is often absent
+_NOT_DONE = [
+    {"done": False},
+    {"done": {"$exists": False}}
+]
+
+# Selectors for the cached collections: everything not marked done
+_CATEGORY_SELECTOR = {"db": "Categories", "$or": _NOT_DONE}
+_TASK_SELECTOR = {"db": "Tasks", "$or": _NOT_DONE}
+
+
+class _BasicAuth(requests.auth.AuthBase):
+    """
+    HTTP Basic auth with the Authorization header encoded once up front.
+
+    requests.auth.HTTPBasicAuth re-encodes the credentials on every request.
+    """
+
+    def __init__(self, username: str, password: str):
+        credentials = f"{username}:{password}".encode("latin1")
+        self.header = f"Basic {base64.b64encode(credentials).decode('ascii')}"
+
+    def __call__(self, request):
+        request.headers["Authorization"] = self.header
+        return request
+
 
 class MarvinAPI:
     """
@@ -29,21 +139,25 @@ class MarvinAPI:
     This class provides raw API access to the Amazing Marvin database.
     """
 
-    def __init__(self, log_level=None):
+    def __init__(self, log_level=None, watch_changes: Optional[bool] = None,
+                 create_indexes: Optional[bool] = None):
         """
         Initialize the MarvinAPI with connection details from environment variables.
 
         Args:
             log_level: Optional logging level (e.g., logging.DEBUG, logging.INFO)
+            watch_changes: Follow the continuous _changes feed in background threads so
+                cached reads need no HTTP round trip. Defaults to the WATCH_CHANGES
+                environment variable, off unless set to "true" or "1".
+            create_indexes: Create the Mango indexes backing _find queries in a
+                _design/amazing-marvin-mcp document. Defaults to the CREATE_INDEXES
+                environment variable, off unless set to "true" or "1".
         """
         # Set up logger
         self.logger = logging.getLogger('MarvinAPI')
         if log_level is not None:
             self.logger.setLevel(log_level)
 
-        # Load environment variables
-        load_dotenv()
-
         # Get database connection details from environment variables
         self.db_name = os.environ.get("DB_NAME")
         self.db_url = os.environ.get("DB_URL")
@@ -56,9 +170,9 @@ class MarvinAPI:
         # Create the base URL for CouchDB requests
         self.base_url = f"{self.db_url}/{self.db_name}"
 
-        # Initialize the session with auth credentials
-        self.session = requests.Session()
-        self.session.auth = (self.db_username, self.db_password)
+        # Use the shared session; auth is sent with each request
+        self.session = _SESSION
+        self._auth = _BasicAuth(self.db_username, self.db_password)
         self.logger.debug(
             f"Initialized MarvinAPI with database: {self.db_name}")
 
@@ -68,6 +182,39 @@ class MarvinAPI:
         self._tasks_cache = None
         self._tasks_last_seq = '0'
 
+        # Index creation writes a design document, so it is opt-in
+        if create_indexes is None:
+            create_indexes = os.environ.get("CREATE_INDEXES", "").lower() in ("1", "true")
+        self._create_indexes = create_indexes
+
+        # Push-style invalidation: caches with a live watcher are only refreshed
+        # once the watcher has seen a change
+        self._dirty = {"categories": True, "tasks": True}
+        self._watching = set()
+        # Held from clearing the dirty flag until the fetched list is stored, so
+        # concurrent reads cannot store an older list over a newer one
+        self._cache_locks = {"categories": threading.Lock(), "tasks": threading.Lock()}
+        self._stop_watching = threading.Event()
+        self._watch_threads: List[threading.Thread] = []
+        self._watch_responses: Dict[str, requests.Response] = {}
+        if watch_changes is None:
+            watch_changes = os.environ.get("WATCH_CHANGES", "").lower() in ("1", "true")
+        if watch_changes:
+            for name, selector in (("categories", _CATEGORY_SELECTOR), ("tasks", _TASK_SELECTOR)):
+                thread = threading.Thread(target=self._watch_changes, args=(name, selector),
+                                          name=f"marvin-watch-{name}", daemon=True)
+                thread.start()
+                self._watch_threads.append(thread)
+
+    def close(self) -> None:
+        """Stop the change watcher threads, if any, and release their connections."""
+        self._stop_watching.set()
+        for response in list(self._watch_responses.values()):
+            response.close()
+        for thread in self._watch_threads:
+            thread.join(timeout=5)
+        self._watch_threads.clear()
+
     def _validate_env_vars(self):
         """Validate that all required environment variables are set."""
         missing_vars = []
@@ -96,19 +243,65 @@ class MarvinAPI:
             # Try to get the database info
             self.logger.info(
                 f"Testing connection to {self.db_url}/{self.db_name}")
-            response = self.session.get(self.base_url)
+            response = self.session.get(self.base_url, auth=self._auth)
             response.raise_for_status()
             self.logger.info("Database connection successful!")
-            self.logger.debug(f"Database info: {response.json()}")
+            self.logger.debug(f"Database info: {_json_loads(response.content)}")
             return True
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error connecting to database: {e}")
             return False
 
-    def _check_changes(self, last_seq: str, selector: Dict[str, Any]) -> Optional[str]:
+    def _ensure_indexes(self) -> bool:
+        """
+        Create the Mango indexes used by _find queries once per database.
+
+        A failed attempt is not remembered, so the next query tries again.
+
+        Returns:
+            bool: True if the indexes exist, False if creation is disabled or failed.
+        """
+        if not self._create_indexes:
+            return False
+
+        with _INDEXES_LOCK:
+            if self.base_url in _INDEXED_DATABASES:
+                return True
+
+            url = f"{self.base_url}/_index"
+            self.logger.info(f"Creating Mango indexes in _design/{_INDEX_DDOC}")
+            try:
+                for name, fields in _INDEXES.items():
+                    index = {
+                        "index": {"fields": fields},
+                        "ddoc": _INDEX_DDOC,
+                        "name": name,
+                        "type": "json"
+                    }
+                    response = self.session.post(url, data=_json_dumps(index), auth=self._auth)
+                    response.raise_for_status()
+                    self.logger.debug(
+                        f"Index {name}: {_json_loads(response.content).get('result')}")
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(
+                    f"Could not create Mango indexes, this query will scan the database: {e}")
+                return False
+            _INDEXED_DATABASES.add(self.base_url)
+            return True
+
+    def _with_index(self, query: Dict[str, Any], index_name: str) -> Dict[str, Any]:
+        """Add a use_index hint to a _find query if our indexes are available."""
+        if self._ensure_indexes():
+            query["use_index"] = [_INDEX_DDOC, index_name]
+        return query
+
+    def _check_changes(self, last_seq: str, selector: Dict[str, Any]) -> Tuple[str, bool]:
         """
         Check the _changes feed for documents matching the selector since last_seq.
-        Returns new last_seq if changes found, or None if no changes.
+        Pass last_seq='now' to only read the current sequence without listing changes.
+
+        Returns:
+            Tuple of (current sequence, whether any matching changes were found)
         """
         url = f"{self.base_url}/_changes"
         params = {
@@ -121,27 +314,124 @@ class MarvinAPI:
             self.logger.debug(
                 f"Checking changes since {last_seq} with selector: {json.dumps(selector)}")
             response = self.session.post(
-                url, params=params, json={'selector': selector})
+                url, params=params, data=_json_dumps({'selector': selector}), auth=self._auth)
             response.raise_for_status()
-            changes = response.json()
+            changes = _json_loads(response.content)
             new_last_seq = str(changes.get('last_seq'))
             if not changes.get('results'):
                 self.logger.debug(
                     f"No relevant changes found since {last_seq}. Current seq: {new_last_seq}")
-                return new_last_seq if last_seq == '0' else None
+                return new_last_seq, False
             else:
                 self.logger.debug(
                     f"Changes found since {last_seq}. New seq: {new_last_seq}")
-                return new_last_seq
+                return new_last_seq, True
         except Exception as e:
             self.logger.error(f"Error checking changes feed: {e}")
             raise
 
+    def _watch_changes(self, name: str, selector: Dict[str, Any]) -> None:
+        """
+        Follow the continuous _changes feed for selector, marking the named cache dirty on every change.
+
+        Runs in a daemon thread until close() is called. While the feed is disconnected the
+        cache falls back to probing _changes on each read, and the feed is reopened with a
+        capped backoff.
+        """
+        url = f"{self.base_url}/_changes"
+        params = {
+            'feed': 'continuous',
+            'filter': '_selector',
+            'since': 'now',
+            'heartbeat': 30000
+        }
+        delay = 1
+        while not self._stop_watching.is_set():
+            try:
+                with self.session.post(url, params=params, data=_json_dumps({'selector': selector}),
+                                       auth=self._auth, stream=True, timeout=(10, 90)) as response:
+                    self._watch_responses[name] = response
+                    if self._stop_watching.is_set():
+                        break
+                    response.raise_for_status()
+                    # Changes may have been missed while disconnected
+                    self._dirty[name] = True
+                    self._watching.add(name)
+                    self.logger.info(f"Watching _changes feed for {name}")
+                    delay = 1
+                    for line in response.iter_lines():
+                        if line:  # blank lines are heartbeats
+                            self._dirty[name] = True
+            except Exception as e:
+                if not self._stop_watching.is_set():
+                    self.logger.warning(f"Change watcher for {name} disconnected: {e}")
+            finally:
+                self._watch_responses.pop(name, None)
+                self._watching.discard(name)
+            self._stop_watching.wait(delay)
+            delay = min(delay * 2, 60)
+
+    def _find(self, selector: Dict[str, Any], fields: List[str], index_name: str) -> List[Dict[str, Any]]:
+        """
+        Run a Mango _find query and return the matching documents.
+
+        Args:
+            selector: CouchDB selector for the query
+            fields: Document fields to return
+            index_name: Name of the Mango index to hint for the query
+
+        Returns:
+            List of matching documents
+        """
+        url = f"{self.base_url}/_find"
+        query = self._with_index(
+            {"selector": selector, "fields": fields}, index_name)
+        self.logger.debug(f"Running _find with query: {json.dumps(query)}")
+        if ijson is not None:
+            # Parse documents straight off the socket so the raw body and the parsed
+            # documents are never held in memory at the same time
+            with self.session.post(url, data=_json_dumps(query), auth=self._auth,
+                                   stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                return list(ijson.items(response.raw, "docs.item", use_float=True))
+
+        response = self.session.post(url, data=_json_dumps(query), auth=self._auth)
+        response.raise_for_status()
+        return _json_loads(response.content).get("docs", [])
+
+    @staticmethod
+    def _next_ranks(docs: List[Dict[str, Any]], parent_id: str) -> Tuple[int, int]:
+        """
+        Compute rank and masterRank for a new document.
+
+        Args:
+            docs: Existing documents of the same kind
+            parent_id: ID of the parent the new document is created under
+
+        Returns:
+            Tuple of (rank, masterRank): one past the highest rank among all docs,
+            and one past the highest masterRank among docs with the same parent
+        """
+        max_rank = max(
+            (d.get("rank", 0) for d in docs if isinstance(
+                d.get("rank", 0), (int, float))),
+            default=0
+        )
+        max_master_rank = max(
+            (d.get("masterRank", 0) for d in docs if d.get("parentId") == parent_id
+             and isinstance(d.get("masterRank", 0), (int, float))),
+            default=0
+        )
+        return max_rank + 1, max_master_rank + 1
+
     def _fetch_documents(self, 
                           selector: Dict[str, Any], 
                           cache: Optional[List[Dict[str, Any]]], 
                           last_seq: str,
-                          cache_name: str) -> Tuple[List[Dict[str, Any]], str]:
+                          cache_name: str,
+                          fields: List[str],
+                          index_name: str = "by-db") -> Tuple[List[Dict[str, Any]], str]:
         """
         Helper method to fetch documents from CouchDB with caching and change detection.
         
@@ -150,37 +440,37 @@ class MarvinAPI:
             cache: Current cache for this document type
             last_seq: Current sequence number for change detection
             cache_name: Name of the cache for logging (e.g., "tasks", "categories")
+            fields: Document fields to return
+            index_name: Name of the Mango index to hint for the query
             
         Returns:
             Tuple of (documents list, new sequence number)
         """
         try:
-            new_seq = self._check_changes(last_seq, selector)
-            if new_seq is None and cache is not None:
-                self.logger.info(
-                    f"Returning cached {cache_name} (no changes detected).")
-                return cache, last_seq
+            if cache is not None and cache_name in self._watching:
+                if not self._dirty[cache_name]:
+                    self.logger.info(
+                        f"Returning cached {cache_name} (watcher saw no changes).")
+                    return cache, last_seq
+            # Clear before fetching so a change arriving mid-fetch marks it dirty again
+            self._dirty[cache_name] = False
+
+            if cache is None:
+                # Nothing to validate yet; record the current sequence before fetching
+                # so changes made during the fetch are picked up by the next probe
+                new_seq, _ = self._check_changes('now', selector)
+            else:
+                new_seq, has_changes = self._check_changes(last_seq, selector)
+                if not has_changes:
+                    self.logger.info(
+                        f"Returning cached {cache_name} (no changes detected).")
+                    return cache, new_seq
 
             self.logger.info(
                 f"Fetching fresh {cache_name} (changes detected or cache empty).")
-            url = f"{self.base_url}/_find"
-            query = {"selector": selector}
-            self.logger.debug(
-                f"Fetching {cache_name} with query: {json.dumps(query)}")
-            response = self.session.post(url, json=query)
-            response.raise_for_status()
-            result = response.json()
-            documents = result.get("docs", [])
-            for doc in documents:
-                if "fieldUpdates" in doc:
-                    del doc["fieldUpdates"]
+            documents = self._find(selector, fields, index_name)
             self.logger.info(
                 f"Successfully fetched {len(documents)} {cache_name}")
-            
-            if new_seq is None:
-                current_seq = self._check_changes('0', selector)
-                new_seq = current_seq or last_seq
-                
             return documents, new_seq
         except Exception as e:
             self.logger.error(f"Error fetching {cache_name}: {str(e)}")
@@ -191,26 +481,21 @@ class MarvinAPI:
         Fetch all categories from the CouchDB database, using a cache invalidated by the _changes feed.
         
         Returns:
-            List of category/project documents
+            List of category/project documents, limited to the fields in _CATEGORY_FIELDS
         """
-        category_selector = {
-            "db": "Categories",
-            "$or": [
-                {"done": False},
-                {"done": {"$exists": False}}
-            ]
-        }
-        try:
-            categories, new_seq = self._fetch_documents(
-                category_selector, self._categories_cache, self._categories_last_seq, "categories")
-            self._categories_cache = categories
-            self._categories_last_seq = new_seq
-            return categories
-        except Exception as e:
-            self.logger.error(f"Error fetching categories: {str(e)}")
-            self._categories_cache = None
-            self._categories_last_seq = '0'
-            raise
+        with self._cache_locks["categories"]:
+            try:
+                categories, new_seq = self._fetch_documents(
+                    _CATEGORY_SELECTOR, self._categories_cache, self._categories_last_seq,
+                    "categories", _CATEGORY_FIELDS)
+                self._categories_cache = categories
+                self._categories_last_seq = new_seq
+                return categories
+            except Exception as e:
+                self.logger.error(f"Error fetching categories: {str(e)}")
+                self._categories_cache = None
+                self._categories_last_seq = '0'
+                raise
 
     def get_tasks(self, parent_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -221,32 +506,18 @@ class MarvinAPI:
             parent_id: Optional ID of the parent project to filter tasks
             
         Returns:
-            List of task documents
+            List of task documents, limited to the fields in _TASK_FIELDS
         """
         if parent_id:
             self.logger.info(
                 f"Fetching tasks for specific parent {parent_id}, bypassing cache.")
             try:
-                query = {
-                    "selector": {
-                        "db": "Tasks",
-                        "parentId": parent_id,
-                        "$or": [
-                            {"done": False},
-                            {"done": {"$exists": False}}
-                        ]
-                    }
+                selector = {
+                    "db": "Tasks",
+                    "parentId": parent_id,
+                    "$or": _NOT_DONE
                 }
-                url = f"{self.base_url}/_find"
-                self.logger.debug(
-                    f"Fetching tasks for parent {parent_id} with query: {json.dumps(query)}")
-                response = self.session.post(url, json=query)
-                response.raise_for_status()
-                result = response.json()
-                tasks = result.get("docs", [])
-                for task in tasks:
-                    if "fieldUpdates" in task:
-                        del task["fieldUpdates"]
+                tasks = self._find(selector, _TASK_FIELDS, "tasks-by-parent")
                 self.logger.info(
                     f"Successfully fetched {len(tasks)} tasks for parent {parent_id}")
                 return tasks
@@ -256,24 +527,19 @@ class MarvinAPI:
                 raise
 
         # Always fetch only incomplete tasks
-        task_selector = {
-            "db": "Tasks",
-            "$or": [
-                {"done": False},
-                {"done": {"$exists": False}}
-            ]
-        }
-        try:
-            tasks, new_seq = self._fetch_documents(
-                task_selector, self._tasks_cache, self._tasks_last_seq, "tasks")
-            self._tasks_cache = tasks
-            self._tasks_last_seq = new_seq
-            return tasks
-        except Exception as e:
-            self.logger.error(f"Error fetching tasks: {str(e)}")
-            self._tasks_cache = None
-            self._tasks_last_seq = '0'
-            raise
+        with self._cache_locks["tasks"]:
+            try:
+                tasks, new_seq = self._fetch_documents(
+                    _TASK_SELECTOR, self._tasks_cache, self._tasks_last_seq,
+                    "tasks", _TASK_FIELDS)
+                self._tasks_cache = tasks
+                self._tasks_last_seq = new_seq
+                return tasks
+            except Exception as e:
+                self.logger.error(f"Error fetching tasks: {str(e)}")
+                self._tasks_cache = None
+                self._tasks_last_seq = '0'
+                raise
 
     def get_tasks_by_day(self, day: str, include_completed: bool = True) -> List[Dict[str, Any]]:
         """
@@ -284,7 +550,7 @@ class MarvinAPI:
             include_completed: Whether to include completed tasks
             
         Returns:
-            List of task documents scheduled for the specified day
+            List of task documents scheduled for the specified day, limited to _TASK_FIELDS
         """
         self.logger.info(f"Fetching tasks for day: {day}")
         
@@ -296,26 +562,11 @@ class MarvinAPI:
         
         # Add completion filter if needed
         if not include_completed:
-            selector["$or"] = [
-                {"done": False},
-                {"done": {"$exists": False}}
-            ]
+            selector["$or"] = _NOT_DONE
         
         try:
             # We don't use cache for day-specific queries
-            url = f"{self.base_url}/_find"
-            query = {"selector": selector}
-            self.logger.debug(
-                f"Fetching tasks for day {day} with query: {json.dumps(query)}")
-            response = self.session.post(url, json=query)
-            response.raise_for_status()
-            result = response.json()
-            tasks = result.get("docs", [])
-            
-            # Remove fieldUpdates
-            for task in tasks:
-                if "fieldUpdates" in task:
-                    del task["fieldUpdates"]
+            tasks = self._find(selector, _TASK_FIELDS, "tasks-by-day")
             
             # Sort tasks by completion (incomplete first), then priority, then masterRank
             tasks.sort(key=lambda t: (
@@ -353,17 +604,7 @@ class MarvinAPI:
         current_time = int(time.time()*1000)
 
         # Fetch all tasks to determine rank/masterRank
-        all_tasks = self.get_tasks()
-        # rank: max rank among all tasks + 1
-        max_rank = max((t.get("rank", 0) for t in all_tasks if isinstance(
-            t.get("rank", 0), (int, float))), default=0)
-        new_rank = max_rank + 1
-
-        # masterRank: max masterRank among tasks in the same parent + 1
-        parent_tasks = [t for t in all_tasks if t.get("parentId") == parent_id]
-        max_master_rank = max((t.get("masterRank", 0) for t in parent_tasks if isinstance(
-            t.get("masterRank", 0), (int, float))), default=0)
-        new_master_rank = max_master_rank + 1
+        new_rank, new_master_rank = self._next_ranks(self.get_tasks(), parent_id)
 
         # Create the task document
         task = {
@@ -392,10 +633,12 @@ class MarvinAPI:
 
         # Insert the document into CouchDB
         try:
-            response = self.session.post(self.base_url, json=task)
+            response = self.session.post(self.base_url, data=_json_dumps(task), auth=self._auth)
             response.raise_for_status()
+            # Don't rely on the watcher having seen our own write yet
+            self._dirty["tasks"] = True
             self.logger.info(f"Successfully created task: {title}")
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             self.logger.error(f"Error creating task: {str(e)}")
             raise
@@ -420,23 +663,7 @@ class MarvinAPI:
         current_time = int(time.time()*1000)
 
         # Fetch all categories to determine rank/masterRank
-        all_categories = self.get_categories()
-        # rank: max rank among all categories + 1
-        max_rank = max(
-            (c.get("rank", 0) for c in all_categories if isinstance(
-                c.get("rank", 0), (int, float))),
-            default=0
-        )
-        new_rank = max_rank + 1
-
-        # masterRank: max masterRank among categories in the same parent + 1
-        parent_categories = [c for c in all_categories if c.get("parentId") == parent_id]
-        max_master_rank = max(
-            (c.get("masterRank", 0) for c in parent_categories if isinstance(
-                c.get("masterRank", 0), (int, float))),
-            default=0
-        )
-        new_master_rank = max_master_rank + 1
+        new_rank, new_master_rank = self._next_ranks(self.get_categories(), parent_id)
 
         # Create the project document
         project = {
@@ -458,10 +685,11 @@ class MarvinAPI:
 
         # Insert the document into CouchDB
         try:
-            response = self.session.post(self.base_url, json=project)
+            response = self.session.post(self.base_url, data=_json_dumps(project), auth=self._auth)
             response.raise_for_status()
+            self._dirty["categories"] = True
             self.logger.info(f"Successfully created project: {title}")
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             self.logger.error(f"Error creating project: {str(e)}")
             raise
@@ -485,23 +713,7 @@ class MarvinAPI:
         current_time = int(time.time()*1000)
 
         # Fetch all categories to determine rank/masterRank
-        all_categories = self.get_categories()
-        # rank: max rank among all categories + 1
-        max_rank = max(
-            (c.get("rank", 0) for c in all_categories if isinstance(
-                c.get("rank", 0), (int, float))),
-            default=0
-        )
-        new_rank = max_rank + 1
-
-        # masterRank: max masterRank among categories in the same parent + 1
-        parent_categories = [c for c in all_categories if c.get("parentId") == parent_id]
-        max_master_rank = max(
-            (c.get("masterRank", 0) for c in parent_categories if isinstance(
-                c.get("masterRank", 0), (int, float))),
-            default=0
-        )
-        new_master_rank = max_master_rank + 1
+        new_rank, new_master_rank = self._next_ranks(self.get_categories(), parent_id)
 
         # Create the category document
         category = {
@@ -523,10 +735,11 @@ class MarvinAPI:
 
         # Insert the document into CouchDB
         try:
-            response = self.session.post(self.base_url, json=category)
+            response = self.session.post(self.base_url, data=_json_dumps(category), auth=self._auth)
             response.raise_for_status()
+            self._dirty["categories"] = True
             self.logger.info(f"Successfully created category: {title}")
-            return response.json()
+            return _json_loads(response.content)
         except Exception as e:
             self.logger.error(f"Error creating category: {str(e)}")
             raise
@@ -547,9 +760,9 @@ class MarvinAPI:
         # First, get the current task document to ensure we have the latest revision
         try:
             url = f"{self.base_url}/{task_id}"
-            response = self.session.get(url)
+            response = self.session.get(url, auth=self._auth)
             response.raise_for_status()
-            task = response.json()
+            task = _json_loads(response.content)
             
             # Update the updatedAt timestamp
             current_time = int(time.time()*1000)
@@ -564,8 +777,9 @@ class MarvinAPI:
                 task["fieldUpdates"][key] = current_time
             
             # Update the document in CouchDB
-            response = self.session.put(url, json=task)
+            response = self.session.put(url, data=_json_dumps(task), auth=self._auth)
             response.raise_for_status()
+            self._dirty["tasks"] = True
             
             self.logger.info(f"Successfully updated task {task_id}")
             return task
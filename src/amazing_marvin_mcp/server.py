@@ -2,25 +2,21 @@ from mcp.server import Server
 import mcp.server.stdio
 from mcp import types
 import json
-import logging
 
 from .adapter import (
     MarvinAdapter
 )
 from .descriptions import (
-    LIST_TASKS_DESCRIPTION, CREATE_TASK_DESCRIPTION, 
-    CREATE_PROJECT_DESCRIPTION, UPDATE_TASK_DESCRIPTION, 
-    SCHEDULE_TASK_DESCRIPTION, GET_DAY_TASKS_DESCRIPTION,
-    CREATE_CATEGORY_DESCRIPTION,
-    LIST_TASKS_SCHEMA, CREATE_TASK_SCHEMA, CREATE_PROJECT_SCHEMA,
-    UPDATE_TASK_SCHEMA, SCHEDULE_TASK_SCHEMA, GET_DAY_TASKS_SCHEMA,
-    CREATE_CATEGORY_SCHEMA
+    TOOLS_MANIFEST
 )
 
 # Create server
 server = Server("amazing-marvin-mcp", "0.1.0")
 marvin_adapter = MarvinAdapter()
 
+# The tool list never changes, so validate and build it once
+TOOLS = [types.Tool(**tool) for tool in TOOLS_MANIFEST]
+
 # Separate functions for each tool implementation
 async def handle_list_tasks(arguments: dict) -> list[types.TextContent]:
     """
@@ -161,43 +157,7 @@ async def handle_create_category(arguments: dict) -> list[types.TextContent]:
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available tools."""
-    return [
-        types.Tool(
-            name="list_tasks",
-            description=LIST_TASKS_DESCRIPTION,
-            inputSchema=LIST_TASKS_SCHEMA
-        ),
-        types.Tool(
-            name="create_task",
-            description=CREATE_TASK_DESCRIPTION,
-            inputSchema=CREATE_TASK_SCHEMA
-        ),
-        types.Tool(
-            name="create_project",
-            description=CREATE_PROJECT_DESCRIPTION,
-            inputSchema=CREATE_PROJECT_SCHEMA
-        ),
-        types.Tool(
-            name="update_task",
-            description=UPDATE_TASK_DESCRIPTION,
-            inputSchema=UPDATE_TASK_SCHEMA
-        ),
-        types.Tool(
-            name="schedule_task",
-            description=SCHEDULE_TASK_DESCRIPTION,
-            inputSchema=SCHEDULE_TASK_SCHEMA
-        ),
-        types.Tool(
-            name="get_day_tasks",
-            description=GET_DAY_TASKS_DESCRIPTION,
-            inputSchema=GET_DAY_TASKS_SCHEMA
-        ),
-        types.Tool(
-            name="create_category",
-            description=CREATE_CATEGORY_DESCRIPTION,
-            inputSchema=CREATE_CATEGORY_SCHEMA
-        )
-    ]
+    return TOOLS
 
 @server.call_tool()
 async def call_tool(